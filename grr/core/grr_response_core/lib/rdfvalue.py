@@ -16,14 +16,13 @@ from __future__ import unicode_literals
 
 import abc
 import calendar
-import collections
 import datetime
 import functools
 import logging
 import posixpath
 import re
 import time
-from typing import Any, Optional, Text, Union, cast
+from typing import Any, Optional, Text, Union
 import zlib
 
 import dateutil
@@ -78,6 +77,10 @@ class RDFValue(metaclass=RDFValueMetaclass):  # pylint: disable=invalid-metaclas
   RDFValues are serialized to and from the data store.
   """
 
+  # Subclasses that do not declare `__slots__` themselves (e.g. all structs) get
+  # a regular instance `__dict__`; the attributes below are class defaults.
+  __slots__ = ()
+
   # This is how the attribute will be serialized to the data store. It must
   # indicate both the type emitted by SerializeToWireFormat() and expected by
   # FromWireFormat()
@@ -87,6 +90,10 @@ class RDFValue(metaclass=RDFValueMetaclass):  # pylint: disable=invalid-metaclas
   context_help_url = None
 
   _value = None
+
+  # Hash observed by the last `__hash__` call. The class-level default is shared
+  # by all instances so that constructing a value does not need to allocate an
+  # instance attribute for it; it is only set per instance once hashed.
   _prev_hash = None
 
   # Mark as dirty each time we modify this object.
@@ -96,9 +103,6 @@ class RDFValue(metaclass=RDFValueMetaclass):  # pylint: disable=invalid-metaclas
   # assigned here.
   attribute_instance = None
 
-  def __init__(self):
-    self._prev_hash = None
-
   def Copy(self):
     """Make a new copy of this RDFValue."""
     return self.__class__.FromSerializedBytes(self.SerializeToBytes())
@@ -177,16 +181,26 @@ RDFValue.classes["RDFBool"] = bool
 class RDFPrimitive(RDFValue):
   """An immutable RDFValue that wraps a primitive value (e.g. int)."""
 
-  _primitive_value = None
+  # Primitives are instantiated in huge numbers, so they carry no `__dict__`.
+  # Subclasses that need additional state have to declare their own slots.
+  __slots__ = ("_primitive_value",)
 
   def __init__(self, initializer):
-    super().__init__()
     self._primitive_value = initializer
 
   @property
   def _value(self):
     return self._primitive_value
 
+  def __hash__(self):
+    # Primitives are immutable, so there is no need for the mutation check that
+    # `RDFValue.__hash__` performs.
+    return hash(self.SerializeToBytes())
+
+  def __bool__(self):
+    # Reads the slot directly instead of going through the `_value` property.
+    return bool(self._primitive_value)
+
   @classmethod
   def FromHumanReadable(cls, string: Text):
     """Returns a new instance from a human-readable string.
@@ -202,6 +216,9 @@ class RDFPrimitive(RDFValue):
 @functools.total_ordering
 class RDFBytes(RDFPrimitive):
   """An attribute which holds bytes."""
+
+  __slots__ = ()
+
   protobuf_type = "bytes"
 
   def __init__(self, initializer=None):
@@ -240,7 +257,7 @@ class RDFBytes(RDFPrimitive):
     return text.Hexify(self.AsBytes())
 
   def __hash__(self):
-    return hash(self.AsBytes())
+    return hash(self._value)
 
   def __lt__(self, other):
     if isinstance(other, self.__class__):
@@ -261,6 +278,8 @@ class RDFBytes(RDFPrimitive):
 class RDFZippedBytes(RDFBytes):
   """Zipped bytes sequence."""
 
+  __slots__ = ()
+
   def Uncompress(self):
     if self:
       return zlib.decompress(self._value)
@@ -272,16 +291,23 @@ class RDFZippedBytes(RDFBytes):
 class RDFString(RDFPrimitive):
   """Represent a simple string."""
 
+  # UTF-8 encoded form of the value. Values created from bytes keep the original
+  # bytes here so that serializing them does not need to encode them again; for
+  # other values it is computed lazily on first use.
+  __slots__ = ("_utf8",)
+
   protobuf_type = "string"
 
   # TODO(hanuszczak): Allow initializing from arbitrary `unicode`-able object.
   def __init__(self, initializer=None):
+    self._utf8 = None
     if initializer is None:
       super().__init__("")
     if isinstance(initializer, RDFString):
       super().__init__(str(initializer))
     elif isinstance(initializer, bytes):
       super().__init__(initializer.decode("utf-8"))
+      self._utf8 = initializer
     elif isinstance(initializer, Text):
       super().__init__(initializer)
     elif initializer is not None:
@@ -295,6 +321,11 @@ class RDFString(RDFPrimitive):
   def split(self, *args, **kwargs):  # pylint: disable=invalid-name
     return self._value.split(*args, **kwargs)
 
+  def _AsUtf8(self) -> bytes:
+    if self._utf8 is None:
+      self._utf8 = self._value.encode("utf-8")
+    return self._utf8
+
   def __str__(self) -> Text:
     return self._value
 
@@ -318,7 +349,7 @@ class RDFString(RDFPrimitive):
     # error. For now we allow it because too many tests still use non-unicode
     # string literals.
     if isinstance(other, bytes):
-      return self._value.encode("utf-8") == other
+      return self._AsUtf8() == other
 
     return NotImplemented
 
@@ -333,7 +364,7 @@ class RDFString(RDFPrimitive):
     # error. For now we allow it because too many tests still use non-unicode
     # string literals.
     if isinstance(other, bytes):
-      return self._value.encode("utf-8") < other
+      return self._AsUtf8() < other
 
     return NotImplemented
 
@@ -352,7 +383,7 @@ class RDFString(RDFPrimitive):
     return cls(string)
 
   def SerializeToBytes(self):
-    return self._value.encode("utf-8")
+    return self._AsUtf8()
 
   def SerializeToWireFormat(self):
     return self._value
@@ -364,6 +395,8 @@ class RDFString(RDFPrimitive):
 class HashDigest(RDFBytes):
   """Binary hash digest with hex string representation."""
 
+  __slots__ = ()
+
   protobuf_type = "bytes"
 
   def HexDigest(self) -> Text:
@@ -389,10 +422,11 @@ class HashDigest(RDFBytes):
     return not self == other
 
 
-@functools.total_ordering
 class RDFInteger(RDFPrimitive):
   """Represent an integer."""
 
+  __slots__ = ()
+
   protobuf_type = "integer"
 
   @staticmethod
@@ -406,7 +440,7 @@ class RDFInteger(RDFPrimitive):
       super().__init__(int(initializer))
 
   def SerializeToBytes(self) -> bytes:
-    return str(self._value).encode("ascii")
+    return str(self._primitive_value).encode("ascii")
 
   @classmethod
   def FromSerializedBytes(cls, value: bytes):
@@ -423,7 +457,7 @@ class RDFInteger(RDFPrimitive):
     return cls(int(string))
 
   def __str__(self) -> Text:
-    return str(self._value)
+    return str(self._primitive_value)
 
   @classmethod
   def FromWireFormat(cls, value):
@@ -431,49 +465,64 @@ class RDFInteger(RDFPrimitive):
 
   def SerializeToWireFormat(self):
     """Use varint to store the integer."""
-    return self._value
+    return self._primitive_value
 
   def __long__(self):
-    return self._value
+    return self._primitive_value
 
   def __int__(self):
-    return self._value
+    return self._primitive_value
 
   def __float__(self):
-    return float(self._value)
+    return float(self._primitive_value)
 
   def __index__(self):
-    return self._value
+    return self._primitive_value
+
+  # The comparisons are spelled out instead of being derived by
+  # `functools.total_ordering`, whose generated methods call back into `__lt__`
+  # and `__eq__` on every comparison.
+  def __eq__(self, other):
+    return self._primitive_value == other
 
   def __lt__(self, other):
-    return self._value < other
+    return self._primitive_value < other
+
+  def __le__(self, other):
+    return self._primitive_value <= other
+
+  def __gt__(self, other):
+    return self._primitive_value > other
+
+  def __ge__(self, other):
+    return self._primitive_value >= other
 
   def __and__(self, other):
-    return self._value & other
+    return self._primitive_value & other
 
   def __rand__(self, other):
-    return self._value & other
+    return self._primitive_value & other
 
   def __or__(self, other):
-    return self._value | other
+    return self._primitive_value | other
 
   def __ror__(self, other):
-    return self._value | other
+    return self._primitive_value | other
 
   def __add__(self, other):
-    return self._value + other
+    return self._primitive_value + other
 
   def __radd__(self, other):
-    return self._value + other
+    return self._primitive_value + other
 
   def __sub__(self, other):
-    return self._value - other
+    return self._primitive_value - other
 
   def __rsub__(self, other):
-    return other - self._value
+    return other - self._primitive_value
 
   def __mul__(self, other):
-    return self._value * other
+    return self._primitive_value * other
 
   # TODO: There are no `__rop__` methods in Python 3 so all of
   # these should be removed. Also, in general it should not be possible to add
@@ -481,24 +530,43 @@ class RDFInteger(RDFPrimitive):
   # currently a lot of code depends on this behaviour but it should be changed
   # in the future.
   def __rmul__(self, other):
-    return self._value * other
+    return self._primitive_value * other
 
   def __div__(self, other):
-    return self._value.__div__(other)
+    return self._primitive_value.__div__(other)
 
   def __truediv__(self, other):
-    return self._value.__truediv__(other)
+    return self._primitive_value.__truediv__(other)
 
   def __floordiv__(self, other):
-    return self._value.__floordiv__(other)
+    return self._primitive_value.__floordiv__(other)
 
   def __hash__(self):
-    return hash(self._value)
+    return hash(self._primitive_value)
+
+
+# Matches strings that `int` accepts as a plain decimal timestamp, including
+# underscores between digits (e.g. "1_000").
+_INT_TIMESTAMP_RE = re.compile(r"\s*[+-]?\d+(?:_\d+)*\s*")
+
+# Single-entry cache of the last `RDFDatetime.__str__` result as a pair of the
+# number of seconds since epoch and its textual representation. Log lines tend
+# to render the same second many times in a row. The pair is replaced as a
+# whole, so concurrent readers never observe a mismatched entry.
+_last_datetime_str = (None, None)
+
+# Plain numbers that can be added to or subtracted from `RDFDatetime` values as
+# a number of seconds. Kept at module level so that the tuple is not rebuilt on
+# every arithmetic operation.
+_SECONDS_TYPES = (int, float)
 
 
 @functools.total_ordering
 class RDFDatetime(RDFPrimitive):
   """A date and time internally stored in MICROSECONDS."""
+
+  __slots__ = ()
+
   converter = 1000000
   protobuf_type = "unsigned_integer"
 
@@ -535,9 +603,36 @@ class RDFDatetime(RDFPrimitive):
     else:
       return cls(0)
 
+  @classmethod
+  def _FromRawValue(cls, value: int):
+    """Returns a new instance wrapping an already converted integer value.
+
+    This bypasses the type dispatch of the constructor and is meant for hot
+    paths where the value is known to be an `int` in `cls.converter` units.
+
+    Args:
+      value: An integer timestamp expressed in `cls.converter` units.
+    """
+    result = cls.__new__(cls)
+    result._primitive_value = value  # pylint: disable=protected-access
+    return result
+
+  @classmethod
+  def _DurationToRaw(cls, microseconds: int) -> int:
+    """Converts a (signed) duration to `cls.converter` units, rounding down.
+
+    Since `converter` divides a million, adding the result to a raw value gives
+    the same result as adding the duration to the microsecond timestamp and
+    converting back, without the intermediate round-trip.
+
+    Args:
+      microseconds: A number of microseconds to convert.
+    """
+    return microseconds * cls.converter // 1000000
+
   @classmethod
   def Now(cls):
-    return cls(int(time.time() * cls.converter))
+    return cls._FromRawValue(int(time.time() * cls.converter))
 
   def Format(self, fmt: Text) -> Text:
     """Return the value as a string formatted as per strftime semantics."""
@@ -549,7 +644,15 @@ class RDFDatetime(RDFPrimitive):
   def __str__(self) -> Text:
     """Return the date in human readable (UTC)."""
     # TODO: Display microseconds if applicable.
-    return self.Format("%Y-%m-%d %H:%M:%S")
+    global _last_datetime_str
+
+    seconds = self._value // self.converter
+    cached_seconds, result = _last_datetime_str
+    if seconds != cached_seconds:
+      result = compatibility.FormatTime("%Y-%m-%d %H:%M:%S",
+                                        time.gmtime(seconds))
+      _last_datetime_str = (seconds, result)
+    return result
 
   def AsDatetime(self):
     """Return the time as a python datetime object."""
@@ -570,7 +673,7 @@ class RDFDatetime(RDFPrimitive):
   @classmethod
   def FromMicrosecondsSinceEpoch(cls, value):
     precondition.AssertType(value, int)
-    return cls(value * cls.converter // 1000000)
+    return cls._FromRawValue(value * cls.converter // 1000000)
 
   @classmethod
   def FromDatetime(cls, value):
@@ -609,28 +712,26 @@ class RDFDatetime(RDFPrimitive):
     return cls(round((1 - t) * start_time._value + t * end_time._value))  # pylint: disable=protected-access
 
   def __add__(self, other):
+    if isinstance(other, Duration):
+      return self._FromRawValue(self._primitive_value +
+                                self._DurationToRaw(other.microseconds))
     # TODO(hanuszczak): Disallow `float` initialization.
-    if isinstance(other, (int, float)):
+    elif isinstance(other, _SECONDS_TYPES):
       # Assume other is in seconds
       other_microseconds = int(other * self.converter)
-      return self.__class__(self._value + other_microseconds)
-    elif isinstance(other, (DurationSeconds, Duration)):
-      self_us = self.AsMicrosecondsSinceEpoch()
-      duration_us = other.microseconds
-      return self.__class__.FromMicrosecondsSinceEpoch(self_us + duration_us)
+      return self._FromRawValue(self._primitive_value + other_microseconds)
 
     return NotImplemented
 
   def __sub__(self, other):
+    if isinstance(other, Duration):
+      return self._FromRawValue(self._primitive_value +
+                                self._DurationToRaw(-other.microseconds))
     # TODO(hanuszczak): Disallow `float` initialization.
-    if isinstance(other, (int, float)):
+    elif isinstance(other, _SECONDS_TYPES):
       # Assume other is in seconds
       other_microseconds = int(other * self.converter)
-      return self.__class__(self._value - other_microseconds)
-    elif isinstance(other, (DurationSeconds, Duration)):
-      self_us = self.AsMicrosecondsSinceEpoch()
-      duration_us = other.microseconds
-      return self.__class__.FromMicrosecondsSinceEpoch(self_us - duration_us)
+      return self._FromRawValue(self._primitive_value - other_microseconds)
     elif isinstance(other, RDFDatetime):
       diff_us = (
           self.AsMicrosecondsSinceEpoch() - other.AsMicrosecondsSinceEpoch())
@@ -660,10 +761,8 @@ class RDFDatetime(RDFPrimitive):
     # interpret as a timestamp) or as a really human readable thing such as
     # '2000-01-01 13:37'. This is less than ideal (since timestamps are not
     # really "human readable") and should be fixed in the future.
-    try:
+    if _INT_TIMESTAMP_RE.fullmatch(string):
       return cls(int(string))
-    except ValueError:
-      pass
 
     # By default assume the time is given in UTC.
     # pylint: disable=g-tzinfo-datetime
@@ -704,9 +803,18 @@ class RDFDatetime(RDFPrimitive):
   def __int__(self):
     return self._value
 
+  def __repr__(self):
+    # Formatting the raw value is much cheaper than rendering the timestamp with
+    # `__str__`, and `repr` ends up in debug logs and assertion messages a lot.
+    return "<%s(%d)>" % (compatibility.GetName(type(self)),
+                          self._primitive_value)
+
 
 class RDFDatetimeSeconds(RDFDatetime):
   """A DateTime class which is stored in whole seconds."""
+
+  __slots__ = ()
+
   converter = 1
 
 
@@ -721,6 +829,13 @@ WEEKS = 7 * DAYS
 
 _DURATION_RE = re.compile(r"(?P<number>\d+) ?(?P<unit>[a-z]{1,2})?")
 
+# Duration units ordered from the largest to the smallest.
+_DURATION_UNITS = (("w", WEEKS), ("d", DAYS), ("h", HOURS), ("m", MINUTES),
+                   ("s", SECONDS), ("ms", MILLISECONDS), ("us", MICROSECONDS))
+
+# Multipliers of the duration units, keyed by the unit label.
+_DURATION_MULTIPLIERS = dict(_DURATION_UNITS)
+
 
 @functools.total_ordering
 class Duration(RDFPrimitive):
@@ -729,11 +844,10 @@ class Duration(RDFPrimitive):
   The duration is stored as non-negative integer, guaranteeing microsecond
   precision up to MAX_UINT64 microseconds (584k years).
   """
-  protobuf_type = "unsigned_integer"
 
-  _DIVIDERS = collections.OrderedDict(
-      (("w", WEEKS), ("d", DAYS), ("h", HOURS), ("m", MINUTES), ("s", SECONDS),
-       ("ms", MILLISECONDS), ("us", MICROSECONDS)))
+  __slots__ = ()
+
+  protobuf_type = "unsigned_integer"
 
   def __init__(self, initializer=None):
     """Instantiates a new microsecond-based Duration.
@@ -809,12 +923,13 @@ class Duration(RDFPrimitive):
     return "<{} {}>".format(compatibility.GetName(type(self)), self)
 
   def __str__(self) -> Text:
-    if self._value == 0:
+    value = self._value
+    if value == 0:
       return "0 us"
-    for label, divider in self._DIVIDERS.items():
-      if self._value % divider == 0:
-        return "%d %s" % (self._value // divider, label)
-    return "%d us" % self._value  # Make pytype happy.
+    for label, divider in _DURATION_UNITS:
+      if value % divider == 0:
+        return "%d %s" % (value // divider, label)
+    return "%d us" % value  # Make pytype happy.
 
   def __add__(self, other):
     if isinstance(other, Duration):
@@ -851,6 +966,10 @@ class Duration(RDFPrimitive):
     else:
       return NotImplemented
 
+  # Required, because in Python 3 overriding `__eq__` nullifies `__hash__`.
+  def __hash__(self):
+    return hash(self._value)
+
   def __abs__(self):
     return self
 
@@ -929,12 +1048,11 @@ class Duration(RDFPrimitive):
     if unit_string is None:
       unit_string = default_unit
 
-    try:
-      unit_multiplier = cls._DIVIDERS[unit_string]
-    except KeyError:
+    unit_multiplier = _DURATION_MULTIPLIERS.get(unit_string)
+    if unit_multiplier is None:
       raise ValueError(
           "Invalid unit {!r} for duration in {!r}. Expected any of {}.".format(
-              unit_string, string, ", ".join(cls._DIVIDERS)))
+              unit_string, string, ", ".join(_DURATION_MULTIPLIERS)))
 
     return number * unit_multiplier
 
@@ -951,6 +1069,8 @@ class DurationSeconds(Duration):
   simple. For most uses, please prefer `Duration` directly.
   """
 
+  __slots__ = ()
+
   def __init__(self, initializer: Any = None):
     if isinstance(initializer, (int, RDFInteger)):
       initializer = int(initializer) * SECONDS
@@ -982,6 +1102,10 @@ class DurationSeconds(Duration):
     return cls(int(timeunit * value // SECONDS))
 
 
+# Binary units used to render `ByteSize` values, from the largest to smallest.
+_BINARY_BYTE_UNITS = ((1024**3, "GiB"), (1024**2, "MiB"), (1024, "KiB"))
+
+
 class ByteSize(RDFInteger):
   """A size for bytes allowing standard unit prefixes.
 
@@ -989,6 +1113,9 @@ class ByteSize(RDFInteger):
   Binary units (powers of 2): Ki, Mi, Gi
   SI units (powers of 10): k, m, g
   """
+
+  __slots__ = ()
+
   protobuf_type = "unsigned_integer"
 
   DIVIDERS = dict((
@@ -1001,8 +1128,6 @@ class ByteSize(RDFInteger):
       ("gi", 1024**3),
   ))
 
-  REGEX = re.compile("^([0-9.]+) ?([kmgi]*)b?$", re.I)
-
   def __init__(self, initializer=None):
     if isinstance(initializer, ByteSize):
       super().__init__(initializer._value)  # pylint: disable=protected-access
@@ -1019,19 +1144,12 @@ class ByteSize(RDFInteger):
                             type(initializer))
 
   def __str__(self):
-    if self._value >= 1024**3:
-      unit = "GiB"
-      value = self._value / 1024**3
-    elif self._value >= 1024**2:
-      unit = "MiB"
-      value = self._value / 1024**2
-    elif self._value >= 1024:
-      unit = "KiB"
-      value = self._value / 1024
-    else:
-      return "{} B".format(self._value)
+    value = self._value
+    for divider, unit in _BINARY_BYTE_UNITS:
+      if value >= divider:
+        return "{value:.1f} {unit}".format(value=value / divider, unit=unit)
 
-    return "{value:.1f} {unit}".format(value=value, unit=unit)
+    return "{} B".format(value)
 
   @classmethod
   def FromHumanReadable(cls, string: Text):
@@ -1043,16 +1161,25 @@ class ByteSize(RDFInteger):
     if not string:
       return 0
 
-    match = cls.REGEX.match(string.strip().lower())
-    if not match:
+    # The specification is a number optionally followed by a space and a unit
+    # (e.g. "12", "2.5kb" or "3 MiB"). It is simple enough to be split with
+    # string methods, without running it through a regex.
+    spec = string.strip().lower()
+    unit = spec.lstrip("0123456789.")
+    value = spec[:len(spec) - len(unit)]
+    if not value:
       raise DecodeError("Unknown specification for ByteSize %s" % string)
 
-    multiplier = cls.DIVIDERS.get(match.group(2))
+    if unit.startswith(" "):
+      unit = unit[1:]
+    if unit.endswith("b"):
+      unit = unit[:-1]
+
+    multiplier = cls.DIVIDERS.get(unit)
     if not multiplier:
-      raise DecodeError("Invalid multiplier %s" % match.group(2))
+      raise DecodeError("Invalid multiplier %s" % unit)
 
     # The value may be represented as a float, but if not dont lose accuracy.
-    value = match.group(1)
     if "." in value:
       value = float(value)
     else:
@@ -1061,10 +1188,18 @@ class ByteSize(RDFInteger):
     return int(value * multiplier)
 
 
+# Raw string types that URNs can be constructed from. Kept at module level so
+# that the tuple is not rebuilt for every constructed URN.
+_URN_STRING_TYPES = (bytes, Text)
+
+
 @functools.total_ordering
 class RDFURN(RDFPrimitive):
   """An object to abstract URL manipulation."""
 
+  # `_str` caches the `aff4:`-prefixed string form, built on first use.
+  __slots__ = ("_str",)
+
   protobuf_type = "string"
 
   # Careful when changing this value, this is hardcoded a few times in this
@@ -1082,6 +1217,7 @@ class RDFURN(RDFPrimitive):
     # RDFURNs that way is a bit slow since it would try to normalize
     # the path again which is not needed - it comes from another
     # RDFURN so it is already in the correct format.
+    self._str = None
 
     if initializer is None:
       super().__init__("")
@@ -1089,10 +1225,10 @@ class RDFURN(RDFPrimitive):
 
     if isinstance(initializer, RDFURN):
       # Make a direct copy of the other object
-      super().__init__(cast(RDFURN, initializer).Path())
+      super().__init__(initializer._primitive_value)  # pylint: disable=protected-access
       return
 
-    precondition.AssertType(initializer, (bytes, Text))
+    precondition.AssertType(initializer, _URN_STRING_TYPES)
 
     if isinstance(initializer, bytes):
       initializer = initializer.decode("utf-8")
@@ -1105,6 +1241,26 @@ class RDFURN(RDFPrimitive):
       string = string[5:]
     return utils.NormalizePath(string)
 
+  @classmethod
+  def _FromNormalizedPath(cls, path: Text):
+    """Returns a new instance wrapping an already normalized path.
+
+    This skips the normalization done by the constructor, e.g. for results of
+    `utils.JoinPath` which are guaranteed to be normalized already.
+
+    Args:
+      path: A normalized path (without the `aff4:` scheme).
+    """
+    result = cls.__new__(cls)
+    result._primitive_value = path  # pylint: disable=protected-access
+    result._str = None  # pylint: disable=protected-access
+    return result
+
+  def Copy(self):
+    # The path is normalized already, so there is no need to serialize it and
+    # parse it back like `RDFValue.Copy` does.
+    return self._FromNormalizedPath(self._primitive_value)
+
   @classmethod
   def FromSerializedBytes(cls, value: bytes):
     precondition.AssertType(value, bytes)
@@ -1130,10 +1286,13 @@ class RDFURN(RDFPrimitive):
     return str(self)
 
   def Dirname(self):
-    return posixpath.dirname(self._value)
+    return posixpath.dirname(self._primitive_value)
 
   def Basename(self):
-    return posixpath.basename(self.Path())
+    # Same as `posixpath.basename` (the path is always a `str`), without the
+    # overhead of the generic implementation. This is called for every
+    # `SessionID` construction.
+    return self._primitive_value.rpartition("/")[2]
 
   def Add(self, path):
     """Add a relative stem to the current value and return a new RDFURN.
@@ -1152,38 +1311,45 @@ class RDFURN(RDFPrimitive):
     if not isinstance(path, str):
       raise ValueError("Only strings should be added to a URN, not %s" %
                        path.__class__)
-    return self.__class__(utils.JoinPath(self._value, path))
+    return self.__class__._FromNormalizedPath(
+        utils.JoinPath(self._primitive_value, path))
 
   def __str__(self) -> Text:
-    return "aff4:%s" % self._value
+    result = self._str
+    if result is None:
+      result = self._str = "aff4:" + self._primitive_value
+    return result
 
   # Required, because in Python 3 overriding `__eq__` nullifies `__hash__`.
-  __hash__ = RDFPrimitive.__hash__
+  def __hash__(self):
+    # `str` objects cache their own hash, so there is nothing to precompute.
+    return hash(self._primitive_value)
 
   def __eq__(self, other):
+    if isinstance(other, RDFURN):
+      return self._primitive_value == other._primitive_value  # pylint: disable=protected-access
+
     if isinstance(other, str):
-      other = self.__class__(other)
+      # Normalizing is all that constructing a URN from the string would do.
+      return self._primitive_value == self._Normalize(other)
 
-    elif other is None:
+    if other is None:
       return False
 
-    elif not isinstance(other, RDFURN):
-      return NotImplemented
-
-    return self._value == other.Path()
+    return NotImplemented
 
-  def __bool__(self):
-    return bool(self._value)
+  def __lt__(self, other):
+    if isinstance(other, RDFURN):
+      return self._primitive_value < other._primitive_value  # pylint: disable=protected-access
 
-  # TODO: Remove after support for Python 2 is dropped.
-  __nonzero__ = __bool__
+    if isinstance(other, str):
+      return self._primitive_value < other
 
-  def __lt__(self, other):
-    return self._value < other
+    return NotImplemented
 
   def Path(self):
     """Return the path of the urn."""
-    return self._value
+    return self._primitive_value
 
   def Split(self, count=None):
     """Returns all the path components.
@@ -1197,15 +1363,22 @@ class RDFURN(RDFPrimitive):
     Returns:
       A list of path components of this URN.
     """
+    path = self._primitive_value
+
     if count:
-      result = list(filter(None, self._value.split("/", count)))
-      while len(result) < count:
-        result.append("")
+      result = list(filter(None, path.split("/", count)))
+      missing = count - len(result)
+      if missing > 0:
+        result.extend([""] * missing)
 
       return result
 
-    else:
-      return list(filter(None, self._value.split("/")))
+    # Normalized paths only have empty components at the edges, so stripping
+    # the slashes first usually leaves nothing to filter out.
+    result = path.strip("/").split("/")
+    if "" in result:
+      result = list(filter(None, result))
+    return result
 
   def RelativeName(self, volume):
     """Given a volume URN return the relative URN as a unicode string.
@@ -1218,8 +1391,15 @@ class RDFURN(RDFPrimitive):
       A string of the url relative from the volume or None if our URN does not
       start with the volume prefix.
     """
-    string_url = utils.SmartUnicode(self)
-    volume_url = utils.SmartUnicode(volume)
+    if isinstance(volume, RDFURN):
+      # Both URNs share the `aff4:` prefix, so the paths can be used directly.
+      string_url = self._primitive_value
+      volume_url = volume._primitive_value  # pylint: disable=protected-access
+    else:
+      string_url = str(self)
+      volume_url = volume if isinstance(volume, str) else utils.SmartUnicode(
+          volume)
+
     if string_url.startswith(volume_url):
       result = string_url[len(volume_url):]
       # This must always return a relative path so we strip leading "/"s. The
@@ -1235,16 +1415,31 @@ class RDFURN(RDFPrimitive):
 class Subject(RDFURN):
   """A psuedo attribute representing the subject of an AFF4 object."""
 
+  __slots__ = ()
+
 
 DEFAULT_FLOW_QUEUE = RDFURN("F")
+_DEFAULT_FLOW_QUEUE_NAME = DEFAULT_FLOW_QUEUE.Basename()
+
+# Default namespace of session ids. URNs are immutable and `Add` returns a new
+# instance, so the parsed base can be shared by all `SessionID` constructions.
+_DEFAULT_SESSION_ID_BASE = "aff4:/flows"
+_DEFAULT_SESSION_ID_BASE_URN = RDFURN(_DEFAULT_SESSION_ID_BASE)
+
+# This check is weaker than it could be because we allow queues called
+# "DEBUG-user1" and IDs like "TransferStore". We also have to allow flows
+# session ids like H:123456:hunt.
+_SESSION_ID_MATCH = re.compile(r"[-0-9a-zA-Z]+(?::[0-9a-zA-Z]+){0,2}").fullmatch
 
 
 class SessionID(RDFURN):
   """An rdfvalue object that represents a session_id."""
 
+  __slots__ = ()
+
   def __init__(self,
                initializer=None,
-               base="aff4:/flows",
+               base=_DEFAULT_SESSION_ID_BASE,
                queue=DEFAULT_FLOW_QUEUE,
                flow_name=None):
     """Constructor.
@@ -1263,10 +1458,20 @@ class SessionID(RDFURN):
       if flow_name is None:
         flow_name = random.UInt32()
 
+      if queue is DEFAULT_FLOW_QUEUE:
+        queue_name = _DEFAULT_FLOW_QUEUE_NAME
+      else:
+        queue_name = queue.Basename()
+
+      if base == _DEFAULT_SESSION_ID_BASE:
+        base_urn = _DEFAULT_SESSION_ID_BASE_URN
+      else:
+        base_urn = RDFURN(base)
+
       if isinstance(flow_name, int):
-        initializer = RDFURN(base).Add("%s:%X" % (queue.Basename(), flow_name))
+        initializer = base_urn.Add(f"{queue_name}:{flow_name:X}")
       else:
-        initializer = RDFURN(base).Add("%s:%s" % (queue.Basename(), flow_name))
+        initializer = base_urn.Add(f"{queue_name}:{flow_name}")
     else:
       if isinstance(initializer, RDFURN):
         try:
@@ -1283,14 +1488,10 @@ class SessionID(RDFURN):
 
   @classmethod
   def ValidateID(cls, id_str):
-    # This check is weaker than it could be because we allow queues called
-    # "DEBUG-user1" and IDs like "TransferStore". We also have to allow
-    # flows session ids like H:123456:hunt.
-    allowed_re = re.compile(r"^[-0-9a-zA-Z]+(:[0-9a-zA-Z]+){0,2}$")
-    if not allowed_re.match(id_str):
+    if _SESSION_ID_MATCH(id_str) is None:
       raise ValueError("Invalid SessionID: %s" % id_str)
 
 
 # TODO(hanuszczak): Remove this class.
 class FlowSessionID(SessionID):
-  pass
+  __slots__ = ()
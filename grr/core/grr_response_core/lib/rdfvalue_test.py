@@ -9,7 +9,9 @@ from __future__ import unicode_literals
 
 import datetime
 import sys
+import time
 import unittest
+import zlib
 
 from absl import app
 from absl.testing import absltest
@@ -57,6 +59,17 @@ class RDFBytesTest(absltest.TestCase):
     self.assertEqual(result, expected)
 
 
+class RDFZippedBytesTest(absltest.TestCase):
+
+  def testUncompressEmpty(self):
+    self.assertEqual(rdfvalue.RDFZippedBytes().Uncompress(), b"")
+
+  def testUncompress(self):
+    data = b"foobarbaz" * 1024
+    zipped = rdfvalue.RDFZippedBytes(zlib.compress(data))
+    self.assertEqual(zipped.Uncompress(), data)
+
+
 class RDFStringTest(absltest.TestCase):
 
   def testFromHumanReadable(self):
@@ -69,6 +82,32 @@ class RDFStringTest(absltest.TestCase):
     self.assertEqual(rdfvalue.RDFString(u"foo"), b"foo")
     self.assertNotEqual(rdfvalue.RDFString(u"foo"), b"\x80\x81\x82")
 
+  def testSerializeToBytes(self):
+    string = u"zażółć gęślą jaźń"
+
+    result = rdfvalue.RDFString(string)
+    self.assertEqual(result.SerializeToBytes(), string.encode("utf-8"))
+    self.assertEqual(result.SerializeToBytes(), string.encode("utf-8"))
+
+  def testSerializeToBytesRoundTrip(self):
+    raw = u"pchnąć w tę łódź".encode("utf-8")
+    string = rdfvalue.RDFString.FromSerializedBytes(raw)
+    self.assertEqual(str(string), u"pchnąć w tę łódź")
+    self.assertEqual(string.SerializeToBytes(), raw)
+
+  def testInvalidUtf8RaisesOnConstruction(self):
+    with self.assertRaises(UnicodeDecodeError):
+      rdfvalue.RDFString(b"\xff")
+    with self.assertRaises(UnicodeDecodeError):
+      rdfvalue.RDFString.FromSerializedBytes(b"\xff")
+
+  def testSerializeToBytesPassthrough(self):
+    raw = u"jeża lub ośm skrzyń fig".encode("utf-8")
+    string = rdfvalue.RDFString.FromSerializedBytes(raw)
+    self.assertIs(string.SerializeToBytes(), raw)
+    self.assertEqual(string, u"jeża lub ośm skrzyń fig")
+    self.assertIs(string.SerializeToBytes(), raw)
+
   def testLessThanWithBytes(self):
     self.assertLess(rdfvalue.RDFString(u"abc"), b"def")
     self.assertGreater(rdfvalue.RDFString(u"xyz"), b"ghi")
@@ -83,9 +122,20 @@ class RDFStringTest(absltest.TestCase):
   def testLenOfEmoji(self):
     self.assertLen(rdfvalue.RDFString("🚀🚀"), 2)
 
+  def testBool(self):
+    self.assertFalse(rdfvalue.RDFString())
+    self.assertFalse(rdfvalue.RDFString.FromSerializedBytes(b""))
+    self.assertTrue(rdfvalue.RDFString(u"foo"))
+    self.assertTrue(rdfvalue.RDFString.FromSerializedBytes(b"foo"))
+
 
 class RDFIntegerTest(absltest.TestCase):
 
+  def testBool(self):
+    self.assertFalse(rdfvalue.RDFInteger(0))
+    self.assertTrue(rdfvalue.RDFInteger(1))
+    self.assertTrue(rdfvalue.RDFInteger(-1))
+
   def testFromHumanReadable(self):
     result = rdfvalue.RDFInteger.FromHumanReadable(u"42")
     self.assertEqual(result, rdfvalue.RDFInteger(42))
@@ -187,6 +237,51 @@ class RDFDateTimeTest(absltest.TestCase):
     dt = rdfvalue.RDFDatetime.FromHumanReadable("2011-11-11 12:34:56")
     self.assertEqual(dt.Floor(rdfvalue.Duration.From(1, rdfvalue.SECONDS)), dt)
 
+  def testFromHumanReadableTimestamp(self):
+    self.assertEqual(
+        rdfvalue.RDFDatetime.FromHumanReadable("1577836800000000"),
+        rdfvalue.RDFDatetime.FromHumanReadable("2020-01-01"))
+    self.assertEqual(rdfvalue.RDFDatetime.FromHumanReadable(" 42 "),
+                     rdfvalue.RDFDatetime(42))
+    self.assertEqual(rdfvalue.RDFDatetime.FromHumanReadable("-42"),
+                     rdfvalue.RDFDatetime(-42))
+    self.assertEqual(rdfvalue.RDFDatetime.FromHumanReadable("1_000"),
+                     rdfvalue.RDFDatetime(1000))
+    self.assertEqual(rdfvalue.RDFDatetime.FromHumanReadable("+1_000_000"),
+                     rdfvalue.RDFDatetime(1000000))
+
+  def testStr(self):
+    dt = rdfvalue.RDFDatetime.FromHumanReadable("2011-11-11 12:34:56")
+    self.assertEqual(str(dt), "2011-11-11 12:34:56")
+    self.assertEqual(str(dt), "2011-11-11 12:34:56")
+    self.assertEqual(
+        str(dt + rdfvalue.Duration.From(1, rdfvalue.SECONDS)),
+        "2011-11-11 12:34:57")
+    self.assertEqual(
+        str(rdfvalue.RDFDatetimeSeconds.FromSecondsSinceEpoch(60)),
+        "1970-01-01 00:01:00")
+
+  def testRepr(self):
+    timestamp = rdfvalue.RDFDatetime.FromMicrosecondsSinceEpoch(1234567890)
+    self.assertEqual(repr(timestamp), "<RDFDatetime(1234567890)>")
+
+    timestamp = rdfvalue.RDFDatetimeSeconds.FromSecondsSinceEpoch(1234)
+    self.assertEqual(repr(timestamp), "<RDFDatetimeSeconds(1234)>")
+
+  def testNow(self):
+    before = int(time.time() * 1e6)
+    now = rdfvalue.RDFDatetime.Now()
+    after = int(time.time() * 1e6)
+
+    self.assertIsInstance(now, rdfvalue.RDFDatetime)
+    self.assertBetween(now.AsMicrosecondsSinceEpoch(), before, after)
+
+  def testFromMicrosecondsSinceEpoch(self):
+    dt = rdfvalue.RDFDatetime.FromMicrosecondsSinceEpoch(1337)
+    self.assertIsInstance(dt, rdfvalue.RDFDatetime)
+    self.assertEqual(dt.AsMicrosecondsSinceEpoch(), 1337)
+    self.assertEqual(dt, rdfvalue.RDFDatetime(1337))
+
 
 class RDFDatetimeSecondsTest(absltest.TestCase):
 
@@ -243,6 +338,15 @@ class DurationSecondsTest(absltest.TestCase):
     with self.assertRaises(TypeError):
       rdfvalue.DurationSeconds(3.14)
 
+  def testFromHumanReadableDefaultsToSeconds(self):
+    self.assertEqual(
+        rdfvalue.DurationSeconds.FromHumanReadable("42"),
+        rdfvalue.DurationSeconds.From(42, rdfvalue.SECONDS))
+
+  def testFromHumanReadableRaisesOnInvalidUnit(self):
+    with self.assertRaisesRegex(ValueError, "Invalid unit"):
+      rdfvalue.DurationSeconds.FromHumanReadable("42x")
+
   def testSerializeToBytes(self):
     self.assertEqual(
         b"0",
@@ -460,6 +564,17 @@ class DurationTest(absltest.TestCase):
         if a != b:
           self.assertNotEqual(dur_a, dur_b)
 
+  def testHashIsConsistentWithEquality(self):
+    self.assertEqual(
+        hash(rdfvalue.Duration.From(2, rdfvalue.MINUTES)),
+        hash(rdfvalue.Duration.From(120, rdfvalue.SECONDS)))
+    self.assertEqual(
+        hash(rdfvalue.Duration.From(3, rdfvalue.SECONDS)),
+        hash(rdfvalue.DurationSeconds(3)))
+
+    durations = {rdfvalue.Duration.From(1, rdfvalue.DAYS)}
+    self.assertIn(rdfvalue.Duration.From(24, rdfvalue.HOURS), durations)
+
 
 class DocTest(test_lib.DocTest):
   module = rdfvalue
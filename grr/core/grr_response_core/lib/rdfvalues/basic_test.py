@@ -51,6 +51,16 @@ class RDFIntegerTest(rdf_test_base.RDFValueTestMixin, test_lib.GRRBaseTest):
     self.assertLess(rdfvalue.RDFInteger(10), 15)
     self.assertLess(5, rdfvalue.RDFInteger(10))
 
+  def testComparableToRDFIntegers(self):
+    self.assertEqual(rdfvalue.RDFInteger(10), rdfvalue.RDFInteger(10))
+    self.assertNotEqual(rdfvalue.RDFInteger(10), rdfvalue.RDFInteger(5))
+    self.assertLess(rdfvalue.RDFInteger(5), rdfvalue.RDFInteger(10))
+    self.assertLessEqual(rdfvalue.RDFInteger(10), rdfvalue.RDFInteger(10))
+    self.assertGreater(rdfvalue.RDFInteger(10), rdfvalue.RDFInteger(5))
+    self.assertGreaterEqual(rdfvalue.RDFInteger(10), rdfvalue.RDFInteger(10))
+    self.assertLessEqual(5, rdfvalue.RDFInteger(10))
+    self.assertGreaterEqual(15, rdfvalue.RDFInteger(10))
+
   def testDividesAndIsDividableByPrimitiveInts(self):
     self.assertEqual(rdfvalue.RDFInteger(10) // 5, 2)
 
@@ -143,6 +153,25 @@ class ByteSizeTest(rdf_test_base.RDFValueTestMixin, test_lib.GRRBaseTest):
     for string, expected in cases:
       self.assertEqual(expected, rdfvalue.ByteSize(string))
 
+  def testParsingRaisesOnInvalidSpecification(self):
+    for string in ["kb", "12  kb", "12xb", "12 kbb", "12 ikb"]:
+      with self.assertRaises(rdfvalue.DecodeError):
+        rdfvalue.ByteSize(string)
+
+  def testStr(self):
+    cases = [
+        (0, "0 B"),
+        (1023, "1023 B"),
+        (1024, "1.0 KiB"),
+        (1536, "1.5 KiB"),
+        (1024**2, "1.0 MiB"),
+        (3 * 1024**3, "3.0 GiB"),
+        (2048 * 1024**3, "2048.0 GiB"),
+    ]
+
+    for value, expected in cases:
+      self.assertEqual(str(rdfvalue.ByteSize(value)), expected)
+
 
 class RDFURNTest(rdf_test_base.RDFValueTestMixin, test_lib.GRRBaseTest):
   rdfvalue_class = rdfvalue.RDFURN
@@ -174,6 +203,53 @@ class RDFURNTest(rdf_test_base.RDFValueTestMixin, test_lib.GRRBaseTest):
     for path in ["aff4:/test/?#asd", "aff4:/test/#asd", "aff4:/test/?#"]:
       self.assertEqual(path, str(rdfvalue.RDFURN(path)))
 
+  def testAddIsNormalized(self):
+    urn = rdfvalue.RDFURN("aff4:/foo").Add("bar/../baz//quux/")
+    self.assertEqual(urn.Path(), "/foo/baz/quux")
+    self.assertEqual(urn, rdfvalue.RDFURN("aff4:/foo/baz/quux"))
+
+    subject = rdfvalue.Subject("aff4:/foo").Add("bar")
+    self.assertIsInstance(subject, rdfvalue.Subject)
+    self.assertEqual(subject.Path(), "/foo/bar")
+
+  def testStrIsCached(self):
+    urn = rdfvalue.RDFURN("aff4:/foo").Add("bar")
+    self.assertEqual(str(urn), "aff4:/foo/bar")
+    self.assertIs(str(urn), str(urn))
+
+  def testSplit(self):
+    self.assertEqual(rdfvalue.RDFURN("aff4:/").Split(), [])
+    self.assertEqual(rdfvalue.RDFURN("aff4:/foo").Split(), ["foo"])
+    self.assertEqual(
+        rdfvalue.RDFURN("aff4:/foo/bar/baz").Split(), ["foo", "bar", "baz"])
+    self.assertEqual(
+        rdfvalue.RDFURN("aff4:/foo/bar/baz").Split(2), ["foo", "bar/baz"])
+    self.assertEqual(rdfvalue.RDFURN("aff4:/foo").Split(3), ["foo", "", ""])
+    self.assertEqual(rdfvalue.RDFURN("aff4:/").Split(2), ["", ""])
+
+  def testCopy(self):
+    urn = rdfvalue.Subject("aff4:/foo/bar")
+    copy = urn.Copy()
+    self.assertIsNot(copy, urn)
+    self.assertIsInstance(copy, rdfvalue.Subject)
+    self.assertEqual(copy, urn)
+    self.assertEqual(str(copy), "aff4:/foo/bar")
+
+  def testRelativeName(self):
+    urn = rdfvalue.RDFURN("aff4:/foo/bar/baz")
+    self.assertEqual(urn.RelativeName(rdfvalue.RDFURN("aff4:/foo")), "bar/baz")
+    self.assertEqual(urn.RelativeName("aff4:/foo"), "bar/baz")
+    self.assertEqual(urn.RelativeName("aff4:/"), "foo/bar/baz")
+    self.assertEqual(urn.RelativeName(rdfvalue.RDFURN("aff4:/")), "foo/bar/baz")
+    self.assertIsNone(urn.RelativeName(rdfvalue.RDFURN("aff4:/quux")))
+    self.assertIsNone(urn.RelativeName("aff4:/quux"))
+
+  def testBasename(self):
+    self.assertEqual(rdfvalue.RDFURN("aff4:/foo/bar").Basename(), "bar")
+    self.assertEqual(rdfvalue.RDFURN("aff4:/foo").Basename(), "foo")
+    self.assertEqual(rdfvalue.RDFURN("aff4:/").Basename(), "")
+    self.assertEqual(rdfvalue.RDFURN("W").Basename(), "W")
+
   def testComparison(self):
     urn = rdfvalue.RDFURN("aff4:/abc/def")
     self.assertEqual(urn, str(urn))
@@ -196,6 +272,18 @@ class RDFURNTest(rdf_test_base.RDFValueTestMixin, test_lib.GRRBaseTest):
     self.assertNotEqual(s, rdfvalue.RDFURN(s2))
     self.assertFalse(s == rdfvalue.RDFURN(s2))
 
+  def testOrdering(self):
+    urns = [rdfvalue.RDFURN(s) for s in ["b", "c", "a/b", "a"]]
+    self.assertEqual([str(urn) for urn in sorted(urns)],
+                     ["aff4:/a", "aff4:/a/b", "aff4:/b", "aff4:/c"])
+
+    self.assertLess(rdfvalue.RDFURN("aff4:/a"), rdfvalue.RDFURN("aff4:/b"))
+    self.assertGreater(rdfvalue.RDFURN("aff4:/b"), rdfvalue.RDFURN("aff4:/a"))
+    self.assertLessEqual(rdfvalue.RDFURN("aff4:/a"), rdfvalue.RDFURN("aff4:/a"))
+
+    with self.assertRaises(TypeError):
+      _ = rdfvalue.RDFURN("aff4:/a") < 42
+
   def testHashing(self):
 
     m = {}
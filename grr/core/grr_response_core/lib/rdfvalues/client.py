@@ -63,6 +63,8 @@ def _DecodeArgument(arg) -> Text:
 class ClientURN(rdfvalue.RDFURN):
   """A client urn has to have a specific form."""
 
+  __slots__ = ()
+
   # Valid client urns must match this expression.
   CLIENT_ID_RE = re.compile(r"^(aff4:)?/?(?P<clientid>(c|C)\.[0-9a-fA-F]{16})$")
 
@@ -134,7 +136,8 @@ class ClientURN(rdfvalue.RDFURN):
     if not isinstance(path, str):
       raise ValueError("Only strings should be added to a URN.")
 
-    return rdfvalue.RDFURN(utils.JoinPath(self._value, path))
+    return rdfvalue.RDFURN._FromNormalizedPath(  # pylint: disable=protected-access
+        utils.JoinPath(self._primitive_value, path))
 
 
 class PCIDevice(rdf_structs.RDFProtoStruct):
@@ -160,6 +160,10 @@ class ClientURNTests(rdf_test_base.RDFValueTestMixin, test_lib.GRRBaseTest):
     for badurn in error_set:
       self.assertRaises(type_info.TypeValueError, rdf_client.ClientURN, badurn)
 
+  def testHasNoInstanceDict(self):
+    urn = rdf_client.ClientURN("C.00aaeccbb45f33a3")
+    self.assertFalse(hasattr(urn, "__dict__"))
+
 
 class NetworkAddressTests(rdf_test_base.RDFValueTestMixin,
                           test_lib.GRRBaseTest):
@@ -29,6 +29,21 @@ class SessionIDTest(rdf_test_base.RDFValueTestMixin, test_lib.GRRBaseTest):
     rdfvalue.SessionID(rdfvalue.RDFURN("aff4:/flows/DEBUG-user1:12345678"))
     rdfvalue.SessionID(rdfvalue.RDFURN("aff4:/flows/DEBUG-user1:12345678:hunt"))
 
+  def testConstructionFromScratch(self):
+    self.assertEqual(
+        str(rdfvalue.SessionID(flow_name=0xABC123)), "aff4:/flows/F:ABC123")
+    self.assertEqual(
+        str(rdfvalue.SessionID(flow_name="Foo")), "aff4:/flows/F:Foo")
+    self.assertEqual(
+        str(rdfvalue.SessionID(queue=rdfvalue.RDFURN("W"), flow_name="Stats")),
+        "aff4:/flows/W:Stats")
+    self.assertEqual(
+        str(rdfvalue.SessionID(base="aff4:/hunts", flow_name=0x10)),
+        "aff4:/hunts/F:10")
+    self.assertEqual(
+        str(rdfvalue.SessionID(base="aff4:/flows", flow_name=0x10)),
+        "aff4:/flows/F:10")
+
   def testBadStructure(self):
     self.assertRaises(rdfvalue.InitializeError, rdfvalue.SessionID,
                       rdfvalue.RDFURN("aff4:/flows/A:123456:1:"))
@@ -41,6 +56,11 @@ class SessionIDTest(rdf_test_base.RDFValueTestMixin, test_lib.GRRBaseTest):
     self.assertRaises(rdfvalue.InitializeError, rdfvalue.SessionID,
                       rdfvalue.RDFURN("aff4:/flows/:"))
 
+  def testValidateIDRejectsTrailingNewline(self):
+    rdfvalue.SessionID.ValidateID("A:12345678")
+    with self.assertRaises(ValueError):
+      rdfvalue.SessionID.ValidateID("A:12345678\n")
+
   def testBadQueue(self):
     self.assertRaises(rdfvalue.InitializeError, rdfvalue.SessionID,
                       rdfvalue.RDFURN("aff4:/flows/A%b:12345678"))
@@ -45,6 +45,20 @@ class Converter(metaclass=abc.ABCMeta):
     pass
 
 
+# Human-readable boolean literals. The common spellings are listed explicitly
+# so that they can be resolved without normalizing the case of the input.
+_HUMAN_READABLE_BOOLS = {
+    u"1": True,
+    u"TRUE": True,
+    u"True": True,
+    u"true": True,
+    u"0": False,
+    u"FALSE": False,
+    u"False": False,
+    u"false": False,
+}
+
+
 class BoolConverter(Converter):
   """Converter for Python's `bool`."""
   protobuf_type = "unsigned_integer"
@@ -64,13 +78,12 @@ class BoolConverter(Converter):
     return 1 if value else 0
 
   def FromHumanReadable(self, string: Text) -> bool:
-    upper_string = string.upper()
-    if upper_string == u"TRUE" or string == u"1":
-      return True
-    elif upper_string == u"FALSE" or string == u"0":
-      return False
-    else:
+    result = _HUMAN_READABLE_BOOLS.get(string)
+    if result is None:
+      result = _HUMAN_READABLE_BOOLS.get(string.upper())
+    if result is None:
       raise ValueError("Unparsable boolean string: `%s`" % string)
+    return result
 
 
 class RDFValueConverter(Converter):
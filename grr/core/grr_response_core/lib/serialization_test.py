@@ -25,6 +25,10 @@ class BoolConverterTest(absltest.TestCase):
     self.assertIs(serialization.FromHumanReadable(bool, u"FALSE"), False)
     self.assertIs(serialization.FromHumanReadable(bool, u"0"), False)
 
+  def testFromHumanReadableMixedCase(self):
+    self.assertIs(serialization.FromHumanReadable(bool, u"tRuE"), True)
+    self.assertIs(serialization.FromHumanReadable(bool, u"fAlSe"), False)
+
   def testFromHumanReadableRaisesOnIncorrectInteger(self):
     with self.assertRaises(ValueError):
       serialization.FromHumanReadable(bool, u"2")
@@ -24,6 +24,8 @@ from setuptools.command.sdist import sdist
 THIS_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
 os.chdir(THIS_DIRECTORY)
 
+GRR_CYTHONIZE_RDFVALUE_VAR = "GRR_CYTHONIZE_RDFVALUE"
+
 
 def find_data_files(source, ignore_dirs=None):
   ignore_dirs = ignore_dirs or []
@@ -60,6 +62,32 @@ def get_config():
 VERSION = get_config()
 
 
+def get_ext_modules():
+  """Returns the extension modules to build."""
+  ext_modules = [
+      Extension(
+          # TODO: In Python 2, extension name and sources have to
+          # be of type `bytes`. These calls should be removed once support for
+          # Python 2 is dropped.
+          name=str("grr_response_core._semantic"),
+          sources=[str("accelerated/accelerated.c")])
+  ]
+
+  # Compiling the RDFValue primitives with Cython reduces the interpreter
+  # overhead of their small, very frequently called methods. This is opt-in,
+  # because the compiled module shadows the Python source (which is confusing
+  # in editable installs) and requires Cython at build time.
+  if os.environ.get(GRR_CYTHONIZE_RDFVALUE_VAR):
+    # pylint: disable=g-import-not-at-top
+    from Cython.Build import cythonize
+    # pylint: enable=g-import-not-at-top
+    ext_modules.extend(
+        cythonize(["grr_response_core/lib/rdfvalue.py"],
+                  compiler_directives={"language_level": 3}))
+
+  return ext_modules
+
+
 class Develop(develop):
 
   def run(self):
@@ -124,14 +152,7 @@ setup_args = dict(
     packages=find_packages(),
     zip_safe=False,
     include_package_data=True,
-    ext_modules=[
-        Extension(
-            # TODO: In Python 2, extension name and sources have to
-            # be of type `bytes`. These calls should be removed once support for
-            # Python 2 is dropped.
-            name=str("grr_response_core._semantic"),
-            sources=[str("accelerated/accelerated.c")])
-    ],
+    ext_modules=get_ext_modules(),
     cmdclass={
         "develop": Develop,
         "install": install,